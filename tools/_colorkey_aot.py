@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Ahead-of-time build of the color-key kernel used by tools/color_key.py.
+
+Numba's JIT adds compile (or cache-load) time to every short CLI run. This
+script compiles the same kernel once into a native extension module next to
+it (e.g. tools/_colorkey_aot.cpython-311-x86_64-linux-gnu.so); color_key.py
+loads that module when present and skips importing Numba entirely. The built
+module only needs NumPy at runtime.
+
+Usage:
+    python tools/_colorkey_aot.py
+
+Requires Numba (with numba.pycc, deprecated upstream but still shipped) and
+a C compiler. Rebuild after changing the kernel below.
+"""
+
+from pathlib import Path
+
+from numba.pycc import CC
+
+cc = CC("_colorkey_aot")
+cc.output_dir = str(Path(__file__).resolve().parent)
+
+
+@cc.export("key_u8", "i8(u1[:, :, ::1], i8, i8, i8, i8, b1)")
+def key_u8(arr, kr, kg, kb, limit, manhattan):
+    """Zero matching pixels of a C-contiguous (H, W, 4) uint8 array in place.
+
+    Same contract as _key_kernel in color_key.py (keep the two in sync;
+    tools/_colorkey_parity.py checks they agree), but single-threaded: AOT
+    compilation has no parallel target.
+    """
+    height, width = arr.shape[0], arr.shape[1]
+    replaced = 0
+    for y in range(height):
+        for x in range(width):
+            dr = int(arr[y, x, 0]) - kr
+            dg = int(arr[y, x, 1]) - kg
+            db = int(arr[y, x, 2]) - kb
+            if manhattan:
+                d = abs(dr) + abs(dg) + abs(db)
+            else:
+                d = dr * dr + dg * dg + db * db
+            if d <= limit:
+                arr[y, x, 0] = 0
+                arr[y, x, 1] = 0
+                arr[y, x, 2] = 0
+                arr[y, x, 3] = 0
+                replaced += 1
+    return replaced
+
+
+if __name__ == "__main__":
+    cc.compile()
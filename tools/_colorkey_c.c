@@ -0,0 +1,74 @@
+/*
+ * Native color-key kernel for tools/color_key.py, loaded through ctypes.
+ *
+ * Build once next to color_key.py (the script falls back to NumPy or pure
+ * Python when the library is missing):
+ *
+ *     cc -O3 -mavx2 -ftree-vectorize -shared -fPIC \
+ *         tools/_colorkey_c.c -o tools/_colorkey_c.so
+ *
+ * On macOS name the output _colorkey_c.dylib; on Windows (MinGW) use
+ * _colorkey_c.dll. Drop -mavx2 when targeting CPUs without AVX2.
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(_WIN32)
+#define COLORKEY_EXPORT __declspec(dllexport)
+#else
+#define COLORKEY_EXPORT
+#endif
+
+/*
+ * Zero every RGBA pixel of rgba[0 .. 4*n) whose RGB distance to
+ * (kr, kg, kb) is <= limit. limit is the tolerance, squared unless
+ * manhattan is non-zero. Returns the number of pixels replaced.
+ *
+ * Same contract as _key_kernel in color_key.py; run tools/_colorkey_parity.py
+ * after changing either. The loops are branchless over whole 32-bit pixels
+ * so GCC/Clang can vectorize them.
+ */
+COLORKEY_EXPORT size_t color_key(
+    uint8_t *restrict rgba,
+    size_t n,
+    int kr,
+    int kg,
+    int kb,
+    int64_t limit,
+    int manhattan)
+{
+    size_t replaced = 0;
+
+    if (manhattan) {
+        for (size_t i = 0; i < n; i++) {
+            uint8_t *p = rgba + 4 * i;
+            int dr = p[0] - kr;
+            int dg = p[1] - kg;
+            int db = p[2] - kb;
+            int64_t d = (dr < 0 ? -dr : dr) + (dg < 0 ? -dg : dg) + (db < 0 ? -db : db);
+            uint8_t keep = d <= limit ? 0 : 0xFF;
+            p[0] &= keep;
+            p[1] &= keep;
+            p[2] &= keep;
+            p[3] &= keep;
+            replaced += !keep;
+        }
+    } else {
+        for (size_t i = 0; i < n; i++) {
+            uint8_t *p = rgba + 4 * i;
+            int dr = p[0] - kr;
+            int dg = p[1] - kg;
+            int db = p[2] - kb;
+            int64_t d = dr * dr + dg * dg + db * db;
+            uint8_t keep = d <= limit ? 0 : 0xFF;
+            p[0] &= keep;
+            p[1] &= keep;
+            p[2] &= keep;
+            p[3] &= keep;
+            replaced += !keep;
+        }
+    }
+
+    return replaced;
+}
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Check that every keying path in tools/color_key.py gives the same result.
+
+color_key.py keys RGBA pixels through up to six implementations: the C
+library (tools/_colorkey_c.c), the AOT-built Numba module
+(tools/_colorkey_aot.py), the Numba JIT kernel, NumPy, Pillow channel
+operations and a pure-Python loop. This script keys one random image with
+every path available in the current environment, across both distance
+metrics and several tolerances, and compares each result (pixels and
+replaced count) against the pure-Python loop.
+
+Usage:
+    python tools/_colorkey_parity.py
+    python tools/_colorkey_parity.py --size 512 --seed 7
+
+Paths whose library or dependency is missing are reported and skipped, so
+build the C library and AOT module first to cover them. Exits non-zero on
+any mismatch.
+"""
+
+import argparse
+import random
+import sys
+
+from PIL import Image
+
+import color_key as ck
+
+KEY_COLOR = (200, 40, 120)
+TOLERANCES = (0, 1, 10, 64, 254, 300)
+
+
+def make_image(size: int, seed: int) -> Image.Image:
+    """Random RGBA image with many pixels at or near KEY_COLOR.
+
+    A quarter of the pixels are the key itself, a quarter sit exactly one
+    of TOLERANCES away from it along one channel (the boundary both metrics
+    must include), a quarter within 80 per channel and the rest are uniform
+    noise. Alpha is random so the paths are also checked to keep the alpha
+    of pixels they don't match.
+    """
+    rng = random.Random(seed)
+    buf = bytearray()
+    for _ in range(size * size):
+        kind = rng.randrange(4)
+        if kind == 0:
+            rgb = KEY_COLOR
+        elif kind == 1:
+            rgb = list(KEY_COLOR)
+            channel = rng.randrange(3)
+            offset = rng.choice(TOLERANCES) * rng.choice((-1, 1))
+            rgb[channel] = min(max(rgb[channel] + offset, 0), 255)
+        elif kind == 2:
+            rgb = [min(max(c + rng.randint(-80, 80), 0), 255) for c in KEY_COLOR]
+        else:
+            rgb = [rng.randrange(256) for _ in range(3)]
+        buf += bytes(rgb)
+        buf.append(rng.randrange(256))
+    return Image.frombytes("RGBA", (size, size), bytes(buf))
+
+
+def available_paths(tolerance: int, manhattan: bool) -> tuple[list, list[str]]:
+    """Return ([(name, key_fn)], [skipped path names]) for this configuration.
+
+    key_fn(img) keys an RGBA image and returns (result_image, replaced).
+    """
+    paths = []
+    skipped = []
+
+    def add(name, available, key_fn):
+        if available:
+            paths.append((name, key_fn))
+        else:
+            skipped.append(name)
+
+    add(
+        "c",
+        ck._c_kernel is not None,
+        lambda img: ck._key_c(img, KEY_COLOR, tolerance, manhattan),
+    )
+    add(
+        "aot",
+        ck._aot_kernel is not None,
+        lambda img: ck._key_numba(img, KEY_COLOR, tolerance, manhattan, ck._aot_kernel),
+    )
+    add(
+        "jit",
+        ck.np is not None and ck._get_key_kernel() is not None,
+        lambda img: ck._key_numba(img, KEY_COLOR, tolerance, manhattan, ck._get_key_kernel()),
+    )
+    add(
+        "numpy",
+        ck.np is not None,
+        lambda img: ck._key_numpy(img, KEY_COLOR, tolerance, manhattan, True, None),
+    )
+    # Pillow's channel ops only express exact matches and Manhattan < 255.
+    if tolerance == 0 or (manhattan and tolerance < 255):
+        paths.append(("pillow", lambda img: ck._key_pillow(img, KEY_COLOR, tolerance, True)))
+    return paths, skipped
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Check that every color_key.py keying path gives the same result.",
+    )
+    parser.add_argument("--size", type=int, default=256, help="Image width and height. Default: 256.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the image. Default: 0.")
+    args = parser.parse_args()
+
+    img = make_image(args.size, args.seed)
+    original = img.tobytes()
+    failures = 0
+    compared = 0
+    missing = set()
+
+    for manhattan in (False, True):
+        metric = "manhattan" if manhattan else "euclidean"
+        for tolerance in TOLERANCES:
+            expected, expected_count = ck._key_pixels(img, KEY_COLOR, tolerance, manhattan)
+            expected_bytes = expected.tobytes()
+            paths, skipped = available_paths(tolerance, manhattan)
+            missing.update(skipped)
+            for name, key_fn in paths:
+                result, replaced = key_fn(img)
+                compared += 1
+                if img.tobytes() != original:
+                    print(f"  FAIL {name} {metric} tolerance={tolerance}: modified its input")
+                    failures += 1
+                    img = Image.frombytes("RGBA", img.size, original)
+                elif result.mode != "RGBA" or result.tobytes() != expected_bytes:
+                    print(f"  FAIL {name} {metric} tolerance={tolerance}: pixels differ")
+                    failures += 1
+                elif replaced != expected_count:
+                    print(
+                        f"  FAIL {name} {metric} tolerance={tolerance}: "
+                        f"replaced {replaced}, expected {expected_count}"
+                    )
+                    failures += 1
+
+    if missing:
+        print(f"Skipped (not available): {', '.join(sorted(missing))}")
+    print(f"Done: {compared} comparisons against the pure-Python path, {failures} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
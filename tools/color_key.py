@@ -3,25 +3,117 @@
 
 By default, the key color is auto-detected from the top-left pixel of each
 image. Override with --color RRGGBB. A tolerance (--tolerance, default 0)
-allows near-matches to also become transparent.
+allows near-matches to also become transparent. Tolerance is a Euclidean
+distance in RGB space (0-442); pass --manhattan to use the older Manhattan
+distance (0-765) when existing tolerance values must keep their meaning.
 
 Usage:
     python tools/color_key.py assets/raw/hero_sheet.bmp
     python tools/color_key.py assets/raw/hero_sheet.bmp -o assets/textures/hero_sheet.png
     python tools/color_key.py assets/raw/spritesheets/ -o assets/textures/
     python tools/color_key.py sheet.png --color FF00FF --tolerance 10
+    python tools/color_key.py sheet.png --tolerance 30 --manhattan
     python tools/color_key.py folder/ --dry-run
+
+Decoding, RGBA conversion and PNG encoding dominate runtime on small
+sheets. Pillow-SIMD is a drop-in Pillow build that vectorizes them:
+    pip uninstall -y pillow
+    CC="cc -mavx2" pip install -U --force-reinstall pillow-simd
+The innermost loop can also run as a small C library (tools/_colorkey_c.c,
+build command in that file). When it is present next to this script it is
+used ahead of the Python kernels. Without it, `python tools/_colorkey_aot.py`
+precompiles the Numba kernel so short runs skip JIT warmup. After changing
+any keying path, `python tools/_colorkey_parity.py` checks that all of them
+still agree.
 """
 
 import argparse
+import ctypes
+import importlib.machinery
+import importlib.util
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-from PIL import Image
+import PIL
+from PIL import Image, ImageChops
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: without NumPy the Pillow channel-op path is used instead.
+    np = None
 
 SUPPORTED_EXTENSIONS = {".png", ".bmp", ".gif", ".jpg", ".jpeg", ".tga", ".tiff", ".tif"}
 
+# Largest meaningful --tolerance per metric: the distance between black and
+# white, 3 * 255 for Manhattan and ceil(sqrt(3) * 255) for Euclidean.
+MAX_MANHATTAN_TOLERANCE = 765
+MAX_EUCLIDEAN_TOLERANCE = 442
+
+# Batch runs with a fixed --color key same-size files together when the NumPy
+# path is in use (see _plan_tasks and _process_stack).
+STACK_MIN_FILES = 4
+STACK_MAX_FILES = 64
+STACK_MAX_PIXELS = 1 << 22
+
+C_KERNEL_NAMES = ("_colorkey_c.so", "_colorkey_c.dylib", "_colorkey_c.dll")
+AOT_KERNEL_NAME = "_colorkey_aot"
+
+
+def _load_c_kernel():
+    """Load color_key() from the prebuilt C library next to this script, if any."""
+    tools_dir = Path(__file__).resolve().parent
+    for name in C_KERNEL_NAMES:
+        path = tools_dir / name
+        if not path.is_file():
+            continue
+        try:
+            lib = ctypes.CDLL(str(path))
+        except OSError as e:
+            print(f"Warning: failed to load '{path}': {e}", file=sys.stderr)
+            return None
+        kernel = lib.color_key
+        kernel.argtypes = [
+            ctypes.POINTER(ctypes.c_uint8),
+            ctypes.c_size_t,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int64,
+            ctypes.c_int,
+        ]
+        kernel.restype = ctypes.c_size_t
+        return kernel
+    return None
+
+
+_c_kernel = _load_c_kernel()
+
+
+def _load_aot_kernel():
+    """Load key_u8() from the AOT-built extension next to this script, if any."""
+    if np is None:
+        return None
+    tools_dir = Path(__file__).resolve().parent
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        path = tools_dir / (AOT_KERNEL_NAME + suffix)
+        if not path.is_file():
+            continue
+        spec = importlib.util.spec_from_file_location(AOT_KERNEL_NAME, path)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except ImportError as e:
+            print(f"Warning: failed to load '{path}': {e}", file=sys.stderr)
+            return None
+        return module.key_u8
+    return None
+
+
+_aot_kernel = _load_aot_kernel()
+
 
 def parse_hex_color(hex_str: str) -> tuple[int, int, int]:
     """Parse a hex color string (with or without #) into (R, G, B)."""
@@ -36,11 +128,26 @@ def parse_hex_color(hex_str: str) -> tuple[int, int, int]:
 
 
 def detect_key_color(img: Image.Image) -> tuple[int, int, int]:
-    """Sample the top-left pixel as the key color."""
-    pixel = img.getpixel((0, 0))
-    if isinstance(pixel, int):
+    """Sample the top-left pixel as the key color.
+
+    Reads the pixel in the image's own mode, so the image doesn't have to be
+    converted to RGBA first.
+    """
+    if img.mode in ("RGB", "RGBA", "RGBX"):
+        pixel = img.getpixel((0, 0))
+        return (pixel[0], pixel[1], pixel[2])
+    if img.mode in ("L", "LA"):
         # Grayscale
-        return (pixel, pixel, pixel)
+        pixel = img.getpixel((0, 0))
+        value = pixel if isinstance(pixel, int) else pixel[0]
+        return (value, value, value)
+    if img.mode == "P":
+        palette = img.getpalette()
+        if palette is not None:
+            index = img.getpixel((0, 0))
+            return (palette[index * 3], palette[index * 3 + 1], palette[index * 3 + 2])
+    # Anything else (CMYK, 16-bit, ...): convert just the sampled pixel.
+    pixel = img.crop((0, 0, 1, 1)).convert("RGBA").getpixel((0, 0))
     return (pixel[0], pixel[1], pixel[2])
 
 
@@ -49,32 +156,468 @@ def color_distance(c1: tuple[int, int, int], c2: tuple[int, int, int]) -> int:
     return abs(c1[0] - c2[0]) + abs(c1[1] - c2[1]) + abs(c1[2] - c2[2])
 
 
+def color_distance_sq(c1: tuple[int, int, int], c2: tuple[int, int, int]) -> int:
+    """Squared Euclidean distance between two RGB colors."""
+    dr = c1[0] - c2[0]
+    dg = c1[1] - c2[1]
+    db = c1[2] - c2[2]
+    return dr * dr + dg * dg + db * db
+
+
+def pack_rgb(color: tuple[int, int, int]) -> int:
+    """Pack an RGB color as the uint32 an RGBA pixel with alpha 0 reads as.
+
+    Uses the host byte order, so it matches a uint32 view of RGBA bytes.
+    """
+    return int.from_bytes(bytes((color[0], color[1], color[2], 0)), sys.byteorder)
+
+
+# uint32 mask that keeps a packed RGBA pixel's RGB bytes and drops alpha.
+PACKED_RGB_MASK = int.from_bytes(b"\xff\xff\xff\x00", sys.byteorder)
+
+
+def _distance_limit(tolerance: int, manhattan: bool) -> int:
+    """Largest distance value that still counts as a match."""
+    return tolerance if manhattan else tolerance * tolerance
+
+
+def _compile_key_kernel():
+    """Import Numba and build the JIT kernel. Raises ImportError without Numba."""
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True)
+    def _key_kernel(arr, kr, kg, kb, limit, manhattan):
+        """Zero matching pixels of a C-contiguous (H, W, 4) uint8 array in place.
+
+        limit is the tolerance, squared unless manhattan is set. Rows are
+        split across threads with prange. Returns the number of pixels
+        replaced.
+        """
+        height, width = arr.shape[0], arr.shape[1]
+        replaced = 0
+        for y in prange(height):
+            for x in range(width):
+                dr = int(arr[y, x, 0]) - kr
+                dg = int(arr[y, x, 1]) - kg
+                db = int(arr[y, x, 2]) - kb
+                if manhattan:
+                    d = abs(dr) + abs(dg) + abs(db)
+                else:
+                    d = dr * dr + dg * dg + db * db
+                if d <= limit:
+                    arr[y, x, 0] = 0
+                    arr[y, x, 1] = 0
+                    arr[y, x, 2] = 0
+                    arr[y, x, 3] = 0
+                    replaced += 1
+        return replaced
+
+    if _worker_single_thread:
+        from numba import set_num_threads
+
+        set_num_threads(1)
+    return _key_kernel
+
+
+# Numba takes a noticeable time to import even with a warm cache, so the JIT
+# kernel is only loaded once a run actually selects it (see _get_key_kernel).
+_key_kernel = None
+_key_kernel_loaded = False
+_worker_single_thread = False
+
+
+def _get_key_kernel():
+    """Return the Numba JIT kernel, loading it on first use; None without Numba."""
+    global _key_kernel, _key_kernel_loaded
+    if not _key_kernel_loaded:
+        _key_kernel_loaded = True
+        if np is not None:
+            try:
+                _key_kernel = _compile_key_kernel()
+            except ImportError:
+                # Optional: without Numba the plain NumPy path is used.
+                _key_kernel = None
+    return _key_kernel
+
+
+def _key_palette(
+    img: Image.Image,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+    manhattan: bool,
+    count: bool,
+) -> tuple[Image.Image, int]:
+    """Key a palette ("P") image by rewriting its palette and transparency.
+
+    Only the (at most 256) palette entries are tested, and the result stays
+    indexed, so no pixel is visited in Python.
+    """
+    palette = img.getpalette()
+    entries = len(palette) // 3
+    distance = color_distance if manhattan else color_distance_sq
+    limit = _distance_limit(tolerance, manhattan)
+
+    # Per-index alpha, starting from whatever transparency the file carries.
+    alpha = [255] * entries
+    transparency = img.info.get("transparency")
+    if isinstance(transparency, int):
+        if transparency < entries:
+            alpha[transparency] = 0
+    elif isinstance(transparency, bytes):
+        alpha[:len(transparency)] = transparency[:entries]
+
+    matched = []
+    for i in range(entries):
+        entry = (palette[i * 3], palette[i * 3 + 1], palette[i * 3 + 2])
+        if distance(entry, key_color) <= limit:
+            palette[i * 3:i * 3 + 3] = (0, 0, 0)
+            alpha[i] = 0
+            matched.append(i)
+
+    replaced = -1
+    if count:
+        counts = img.histogram()
+        replaced = sum(counts[i] for i in matched)
+
+    result = img.copy()
+    result.putpalette(palette)
+    result.info["transparency"] = bytes(alpha)
+    return result, replaced
+
+
+def _key_c(
+    img: Image.Image,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+    manhattan: bool,
+) -> tuple[Image.Image, int]:
+    """Key an RGBA image with the native C kernel."""
+    buf = bytearray(img.tobytes())
+    ptr = (ctypes.c_uint8 * len(buf)).from_buffer(buf)
+    limit = _distance_limit(tolerance, manhattan)
+    kr, kg, kb = key_color
+    replaced = _c_kernel(ptr, len(buf) // 4, kr, kg, kb, limit, manhattan)
+    return Image.frombytes("RGBA", img.size, buf), replaced
+
+
+def _key_numba(
+    img: Image.Image,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+    manhattan: bool,
+    kernel,
+) -> tuple[Image.Image, int]:
+    """Key an RGBA image with a compiled Numba kernel (JIT or AOT)."""
+    # np.array returns a fresh C-contiguous buffer, so the kernel is
+    # specialized on the u1[:, :, ::1] layout LLVM can vectorize.
+    arr = np.array(img, dtype=np.uint8)
+    limit = _distance_limit(tolerance, manhattan)
+    kr, kg, kb = key_color
+    replaced = int(kernel(arr, kr, kg, kb, limit, manhattan))
+    return Image.fromarray(arr, "RGBA"), replaced
+
+
+class KeyScratch:
+    """Reusable int32 distance planes and match mask for the NumPy path.
+
+    Holds flat buffers that grow to the largest pixel count seen and hands
+    out (height, width) views of them, so a batch of similarly sized sheets
+    allocates its working buffers once.
+    """
+
+    def __init__(self) -> None:
+        self._planes = np.empty((3, 0), dtype=np.int32)
+        self._mask = np.empty(0, dtype=bool)
+
+    def views(self, height: int, width: int):
+        """Return C-contiguous (dr, dg, db, mask) views of shape (height, width)."""
+        size = height * width
+        if size > self._mask.size:
+            self._planes = np.empty((3, size), dtype=np.int32)
+            self._mask = np.empty(size, dtype=bool)
+        shape = (height, width)
+        return (
+            self._planes[0, :size].reshape(shape),
+            self._planes[1, :size].reshape(shape),
+            self._planes[2, :size].reshape(shape),
+            self._mask[:size].reshape(shape),
+        )
+
+
+def _match_mask(
+    arr,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+    manhattan: bool,
+    scratch: KeyScratch,
+):
+    """Bool (H, W) mask of the pixels of an (H, W, 4) uint8 array that match.
+
+    The mask is a view into scratch, valid until scratch is used again.
+    """
+    dr, dg, db, mask = scratch.views(arr.shape[0], arr.shape[1])
+    if tolerance == 0:
+        # Exact match: read each pixel as one packed uint32 and compare it
+        # against the packed key (see pack_rgb) with alpha masked off,
+        # instead of three per-channel differences.
+        packed = arr.view(np.uint32)[..., 0]
+        masked = dr.view(np.uint32)
+        np.bitwise_and(packed, PACKED_RGB_MASK, out=masked)
+        np.equal(masked, pack_rgb(key_color), out=mask)
+        return mask
+
+    kr, kg, kb = key_color
+    # Work channel by channel (SoA): each strided channel view is widened
+    # into its own int32 plane, so the arithmetic below streams full SIMD
+    # vectors instead of reducing over a length-3 pixel axis. int32 holds
+    # both the signed difference and its square. Every step writes into the
+    # scratch planes, so no temporaries are allocated.
+    np.subtract(arr[..., 0], kr, out=dr, dtype=np.int32)
+    np.subtract(arr[..., 1], kg, out=dg, dtype=np.int32)
+    np.subtract(arr[..., 2], kb, out=db, dtype=np.int32)
+    if manhattan:
+        np.abs(dr, out=dr)
+        np.abs(dg, out=dg)
+        np.abs(db, out=db)
+    else:
+        np.multiply(dr, dr, out=dr)
+        np.multiply(dg, dg, out=dg)
+        np.multiply(db, db, out=db)
+    np.add(dr, dg, out=dr)
+    np.add(dr, db, out=dr)
+    np.less_equal(dr, _distance_limit(tolerance, manhattan), out=mask)
+    return mask
+
+
+def _clear_matches(arr, mask) -> None:
+    """Zero the masked pixels of an (H, W, 4) uint8 array in place."""
+    # Clear matches as whole uint32 pixels in one streaming masked store;
+    # arr[mask] = (0, 0, 0, 0) would first gather the indices of every match.
+    np.copyto(arr.view(np.uint32)[..., 0], 0, where=mask)
+
+
+def _key_numpy(
+    img: Image.Image,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+    manhattan: bool,
+    count: bool,
+    scratch: KeyScratch | None,
+) -> tuple[Image.Image, int]:
+    """Key an RGBA image with vectorized NumPy passes."""
+    arr = np.array(img, dtype=np.uint8)
+    if scratch is None:
+        scratch = KeyScratch()
+    mask = _match_mask(arr, key_color, tolerance, manhattan, scratch)
+    _clear_matches(arr, mask)
+    replaced = int(np.count_nonzero(mask)) if count else -1
+    return Image.fromarray(arr, "RGBA"), replaced
+
+
+def _key_pillow(
+    img: Image.Image,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+    count: bool,
+) -> tuple[Image.Image, int]:
+    """Key an RGBA image using Pillow's C channel operations.
+
+    Computes the Manhattan distance. ImageChops.add saturates at 255, so the
+    summed distance is only exact for tolerance < 255 (anything that
+    saturates is already out of range).
+    """
+    key_img = Image.new("RGB", img.size, key_color)
+    r, g, b = ImageChops.difference(img.convert("RGB"), key_img).split()
+    dist = ImageChops.add(ImageChops.add(r, g), b)
+    lut = [255 if v <= tolerance else 0 for v in range(256)]
+    mask = dist.point(lut)
+    replaced = mask.histogram()[255] if count else -1
+    transparent = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    return Image.composite(transparent, img, mask), replaced
+
+
+def _key_pixels(
+    img: Image.Image,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+    manhattan: bool,
+) -> tuple[Image.Image, int]:
+    """Key an RGBA image in pure Python (fallback when NumPy is missing).
+
+    Works on one flat RGBA bytearray with the distance computed inline, so
+    no per-pixel tuple or function call is allocated.
+    """
+    buf = bytearray(img.tobytes())
+    kr, kg, kb = key_color
+    limit = _distance_limit(tolerance, manhattan)
+    clear = b"\x00\x00\x00\x00"
+    replaced = 0
+
+    if manhattan:
+        for i in range(0, len(buf), 4):
+            if abs(buf[i] - kr) + abs(buf[i + 1] - kg) + abs(buf[i + 2] - kb) <= limit:
+                buf[i:i + 4] = clear
+                replaced += 1
+    else:
+        for i in range(0, len(buf), 4):
+            dr = buf[i] - kr
+            dg = buf[i + 1] - kg
+            db = buf[i + 2] - kb
+            if dr * dr + dg * dg + db * db <= limit:
+                buf[i:i + 4] = clear
+                replaced += 1
+
+    return Image.frombytes("RGBA", img.size, buf), replaced
+
+
+def _uses_numpy_path(tolerance: int) -> bool:
+    """Whether RGBA images are keyed by the NumPy path at this tolerance.
+
+    The C and AOT kernels win when built; at tolerance 0 the packed NumPy
+    compare is preferred over the Numba JIT kernel.
+    """
+    if _c_kernel is not None or _aot_kernel is not None or np is None:
+        return False
+    return tolerance == 0 or _get_key_kernel() is None
+
+
+def _uses_native_kernel(tolerance: int) -> bool:
+    """Whether RGBA images are keyed in one native pass (C, AOT or JIT kernel)."""
+    if _c_kernel is not None or _aot_kernel is not None:
+        return True
+    return not _uses_numpy_path(tolerance) and _get_key_kernel() is not None
+
+
+def _may_contain(
+    img: Image.Image,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+) -> bool:
+    """Whether an RGBA image can hold a pixel within tolerance of key_color.
+
+    A match needs every channel within tolerance of the key under either
+    metric, so a channel histogram with no values in that window rules the
+    key out. The histogram is itself a full pass over the image.
+    """
+    hist = img.histogram()
+    for band, value in enumerate(key_color):
+        start = band * 256 + max(value - tolerance, 0)
+        stop = band * 256 + min(value + tolerance, 255) + 1
+        if not any(hist[start:stop]):
+            return False
+    return True
+
+
 def color_key_image(
     img: Image.Image,
     key_color: tuple[int, int, int] | None,
     tolerance: int,
+    manhattan: bool = False,
+    count: bool = True,
+    scratch: KeyScratch | None = None,
 ) -> tuple[Image.Image, tuple[int, int, int], int]:
     """Replace pixels matching key_color (within tolerance) with transparent.
 
-    Returns (result_image, detected_key_color, pixel_count_replaced).
-    """
-    img = img.convert("RGBA")
+    tolerance is a Euclidean RGB distance, or a Manhattan distance when
+    manhattan is set. At tolerance 0 both select exact matches only.
+
+    Uses the C kernel, a Numba kernel or NumPy when available, otherwise
+    Pillow's channel operations, and only falls back to a per-pixel loop for
+    distances Pillow can't express.
+
+    Palette images with an RGB palette are keyed through the palette and
+    returned still indexed. RGB images without a transparency key gain
+    their alpha band in place; other inputs are left untouched. On the
+    multi-pass NumPy and Pillow paths, an explicit key_color that can't
+    occur in the image returns the RGBA image without keying it.
 
-    if key_color is None:
+    Returns (result_image, detected_key_color, pixel_count_replaced). With
+    count=False the count is skipped where it costs an extra pass and is
+    reported as -1. Pass a KeyScratch to reuse the NumPy path's working
+    buffers across calls.
+    """
+    auto_key = key_color is None
+    if auto_key:
         key_color = detect_key_color(img)
 
-    pixels = img.load()
-    width, height = img.size
-    replaced = 0
+    if img.mode == "P" and img.palette is not None and img.palette.mode == "RGB":
+        result, replaced = _key_palette(img, key_color, tolerance, manhattan, count)
+        return result, key_color, replaced
 
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
-            if color_distance((r, g, b), key_color) <= tolerance:
-                pixels[x, y] = (0, 0, 0, 0)
-                replaced += 1
+    # convert() copies even when the mode already matches, and the kernels
+    # below never modify their input, so RGBA images are used as-is.
+    if img.mode == "RGB" and "transparency" not in img.info:
+        # Pillow keeps RGB pixels in 4 bytes, so this promotes the image in
+        # place instead of allocating a converted copy.
+        img.putalpha(255)
+    elif img.mode != "RGBA":
+        img = img.convert("RGBA")
 
-    return img, key_color, replaced
+    # Pre-check only ahead of the multi-pass NumPy, Pillow and pure-Python
+    # paths, where a miss saves a multi-pass kernel. An auto-detected key is
+    # sampled from the image, so it is always present.
+    if (
+        not auto_key
+        and not _uses_native_kernel(tolerance)
+        and not _may_contain(img, key_color, tolerance)
+    ):
+        return img, key_color, 0 if count else -1
+
+    if _c_kernel is not None:
+        result, replaced = _key_c(img, key_color, tolerance, manhattan)
+    elif _aot_kernel is not None:
+        result, replaced = _key_numba(img, key_color, tolerance, manhattan, _aot_kernel)
+    elif _uses_numpy_path(tolerance):
+        result, replaced = _key_numpy(img, key_color, tolerance, manhattan, count, scratch)
+    elif _get_key_kernel() is not None:
+        result, replaced = _key_numba(img, key_color, tolerance, manhattan, _key_kernel)
+    elif tolerance == 0 or (manhattan and tolerance < 255):
+        result, replaced = _key_pillow(img, key_color, tolerance, count)
+    else:
+        result, replaced = _key_pixels(img, key_color, tolerance, manhattan)
+
+    if not count:
+        replaced = -1
+    return result, key_color, replaced
+
+
+def _fill_slot(slot, img: Image.Image) -> None:
+    """Copy an image into one (H, W, 4) slot of a stack as RGBA."""
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    slot[...] = np.asarray(img)
+
+
+def _key_stack(
+    stack,
+    key_color: tuple[int, int, int],
+    tolerance: int,
+    manhattan: bool,
+    count: bool,
+    scratch: KeyScratch | None,
+) -> list[tuple[Image.Image, int]]:
+    """Key a filled (N, H, W, 4) uint8 stack of same-size images in place.
+
+    The stack is matched as one tall (N*H, W, 4) image, so the per-call
+    overhead is paid once per stack rather than once per file. Matching
+    follows color_key_image, but there is no auto-detection, palette path
+    or histogram pre-check.
+
+    Returns one (result_image, pixel_count_replaced) per image, in order;
+    the count is -1 when count=False.
+    """
+    images, height, width, _ = stack.shape
+    if scratch is None:
+        scratch = KeyScratch()
+    tall = stack.reshape(images * height, width, 4)
+    mask = _match_mask(tall, key_color, tolerance, manhattan, scratch)
+    _clear_matches(tall, mask)
+
+    results = []
+    for i in range(images):
+        replaced = int(np.count_nonzero(mask[i * height:(i + 1) * height])) if count else -1
+        results.append((Image.fromarray(stack[i], "RGBA"), replaced))
+    return results
 
 
 def resolve_output_path(input_path: Path, output: Path | None, is_batch: bool) -> Path:
@@ -100,16 +643,233 @@ def collect_input_files(input_path: Path) -> list[Path]:
         return []
 
     if input_path.is_dir():
-        files = []
-        for child in sorted(input_path.iterdir()):
-            if child.is_file() and child.suffix.lower() in SUPPORTED_EXTENSIONS:
-                files.append(child)
+        # scandir's entries carry the file type from the directory listing,
+        # so non-images are filtered by name without a stat() each, and only
+        # the matches are sorted.
+        with os.scandir(input_path) as entries:
+            files = [
+                Path(entry.path)
+                for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS
+                and entry.is_file()
+            ]
+        files.sort()
         return files
 
     print(f"Error: '{input_path}' does not exist", file=sys.stderr)
     return []
 
 
+# Per-process working buffers, shared by every file this process keys.
+_scratch = KeyScratch() if np is not None else None
+
+
+def _save_result(
+    input_file: Path,
+    output_path: Path,
+    result: Image.Image,
+    key_color: tuple[int, int, int],
+    replaced: int,
+    compress_level: int,
+) -> tuple[bool, str]:
+    """Save a keyed image and build its report line."""
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    result.save(output_path, "PNG", compress_level=compress_level)
+    key_hex = f"#{key_color[0]:02X}{key_color[1]:02X}{key_color[2]:02X}"
+    stats = ""
+    if replaced >= 0:
+        total_pixels = result.size[0] * result.size[1]
+        pct = (replaced / total_pixels * 100) if total_pixels > 0 else 0
+        stats = f"  {replaced}/{total_pixels} pixels ({pct:.1f}%)"
+    return True, (
+        f"  OK {input_file.name} -> {output_path.name}  "
+        f"key={key_hex}{stats} "
+        f"[{result.size[0]}x{result.size[1]}]"
+    )
+
+
+def _process_one(
+    input_file: Path,
+    output_path: Path,
+    fixed_key: tuple[int, int, int] | None,
+    tolerance: int,
+    manhattan: bool,
+    count: bool,
+    compress_level: int,
+) -> tuple[bool, str]:
+    """Color-key and save one file. Returns (ok, report line)."""
+    try:
+        img = Image.open(input_file)
+    except Exception as e:
+        return False, f"  ERROR {input_file.name}: failed to open: {e}"
+
+    # Truncated or corrupt files only fail once the pixels are decoded, and
+    # in a batch run one bad file must not take the others down with it.
+    try:
+        result, detected_key, replaced = color_key_image(
+            img, fixed_key, tolerance, manhattan, count, _scratch
+        )
+        return _save_result(
+            input_file, output_path, result, detected_key, replaced, compress_level
+        )
+    except Exception as e:
+        return False, f"  ERROR {input_file.name}: {e}"
+
+
+def _process_stack(
+    jobs: list[tuple[Path, Path]],
+    fixed_key: tuple[int, int, int],
+    tolerance: int,
+    manhattan: bool,
+    count: bool,
+    compress_level: int,
+) -> list[tuple[bool, str]]:
+    """Color-key and save a group of same-size files with one stacked pass.
+
+    Each file is decoded into its stack slot and closed straight away, so
+    only one file handle is open at a time. A file that fails to decode or
+    save is reported on its own; the rest of the stack is still keyed.
+    """
+    results = []
+    loaded = []
+    stack = None
+    for input_file, output_path in jobs:
+        try:
+            img = Image.open(input_file)
+        except Exception as e:
+            results.append((False, f"  ERROR {input_file.name}: failed to open: {e}"))
+            continue
+        with img:
+            if stack is None:
+                width, height = img.size
+                stack = np.empty((len(jobs), height, width, 4), dtype=np.uint8)
+            if img.size == (width, height):
+                try:
+                    _fill_slot(stack[len(loaded)], img)
+                except Exception as e:
+                    # The slot is reused by the next file.
+                    results.append((False, f"  ERROR {input_file.name}: {e}"))
+                else:
+                    loaded.append((input_file, output_path))
+                continue
+        # The file changed size since _plan_tasks read its header.
+        results.append(
+            _process_one(
+                input_file, output_path, fixed_key, tolerance, manhattan, count, compress_level
+            )
+        )
+    if not loaded:
+        return results
+
+    keyed = _key_stack(stack[:len(loaded)], fixed_key, tolerance, manhattan, count, _scratch)
+    for (input_file, output_path), (result, replaced) in zip(loaded, keyed):
+        try:
+            results.append(
+                _save_result(input_file, output_path, result, fixed_key, replaced, compress_level)
+            )
+        except Exception as e:
+            results.append((False, f"  ERROR {input_file.name}: {e}"))
+    return results
+
+
+def _process_task(jobs: list[tuple[Path, Path]], *options) -> list[tuple[bool, str]]:
+    """Run one task from _plan_tasks. Returns one (ok, line) per file.
+
+    Runs in a worker process during batch runs, so it reports back instead
+    of printing.
+    """
+    if len(jobs) == 1:
+        input_file, output_path = jobs[0]
+        return [_process_one(input_file, output_path, *options)]
+    return _process_stack(jobs, *options)
+
+
+def _plan_tasks(
+    jobs: list[tuple[Path, Path]],
+    stack: bool,
+    workers: int,
+) -> list[list[tuple[Path, Path]]]:
+    """Split (input, output) jobs into tasks for _process_task.
+
+    With stack set, same-size files are grouped into stacks of at most
+    STACK_MAX_FILES files and STACK_MAX_PIXELS pixels, and small enough
+    that each size group still spreads over all workers. Stacks of fewer
+    than STACK_MIN_FILES files, and everything else, become tasks of one
+    file. Tasks keep the order of their first file.
+    """
+    if not stack:
+        return [[job] for job in jobs]
+
+    tasks = []
+    by_size = {}
+    for job in jobs:
+        try:
+            # Image.open only reads the header, so this is cheap.
+            with Image.open(job[0]) as img:
+                size, mode = img.size, img.mode
+        except Exception:
+            tasks.append([job])  # _process_one reports the error
+            continue
+        if mode == "P":
+            tasks.append([job])  # keyed through its palette instead
+            continue
+        by_size.setdefault(size, []).append(job)
+
+    for (width, height), group in by_size.items():
+        per_stack = min(
+            STACK_MAX_FILES,
+            STACK_MAX_PIXELS // max(width * height, 1),
+            -(-len(group) // workers),  # ceil: leave a task for every worker
+        )
+        per_stack = max(per_stack, 1)
+        for start in range(0, len(group), per_stack):
+            chunk = group[start:start + per_stack]
+            if len(chunk) >= STACK_MIN_FILES:
+                tasks.append(chunk)
+            else:
+                tasks.extend([job] for job in chunk)
+
+    order = {job: i for i, job in enumerate(jobs)}
+    tasks.sort(key=lambda task: order[task[0]])
+    return tasks
+
+
+def _init_worker() -> None:
+    """Keep each pool worker's Numba kernel single-threaded.
+
+    The pool already spreads files across cores; letting every worker also
+    spawn a thread per core would oversubscribe the machine.
+    """
+    global _worker_single_thread
+    _worker_single_thread = True
+    if _key_kernel is not None:
+        # Already loaded in the parent before the pool forked.
+        from numba import set_num_threads
+
+        set_num_threads(1)
+
+
+def _report(results) -> tuple[int, int]:
+    """Print (ok, line) results as they arrive. Returns (ok_count, error_count)."""
+    ok_count = 0
+    error_count = 0
+    for ok, line in results:
+        if ok:
+            print(line)
+            ok_count += 1
+        else:
+            print(line, file=sys.stderr)
+            error_count += 1
+    return ok_count, error_count
+
+
+def is_pillow_simd() -> bool:
+    """Whether the installed Pillow is a Pillow-SIMD build (tagged .postN)."""
+    return "post" in PIL.__version__
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Color-key sprite sheets: replace a background color with transparency.",
@@ -136,7 +896,12 @@ def main() -> int:
         "--tolerance",
         type=int,
         default=0,
-        help="Color matching tolerance (Manhattan distance in RGB space, 0-765). Default: 0 (exact match).",
+        help="Color matching tolerance (Euclidean distance in RGB space, 0-442). Default: 0 (exact match).",
+    )
+    parser.add_argument(
+        "--manhattan",
+        action="store_true",
+        help="Measure tolerance as Manhattan distance in RGB space (0-765), as in earlier versions.",
     )
     parser.add_argument(
         "--dry-run",
@@ -148,9 +913,29 @@ def main() -> int:
         action="store_true",
         help="Overwrite existing output files without prompting.",
     )
+    parser.add_argument(
+        "--png-compress",
+        type=int,
+        default=1,
+        help="PNG zlib compression level, 0-9. Default: 1 (fast save; use 9 for smaller files).",
+    )
+    parser.add_argument(
+        "--no-stats",
+        action="store_true",
+        help="Don't count replaced pixels (skips a full pass on some code paths).",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of files to process in parallel. Default: one per CPU core.",
+    )
 
     args = parser.parse_args()
 
+    if not is_pillow_simd():
+        print("Hint: pillow-simd speeds up decode/convert/save (see the color_key.py docstring).", file=sys.stderr)
+
     # Parse fixed key color if provided
     fixed_key = None
     if args.color is not None:
@@ -160,8 +945,18 @@ def main() -> int:
             print(f"Error: {e}", file=sys.stderr)
             return 1
 
-    if args.tolerance < 0 or args.tolerance > 765:
-        print("Error: --tolerance must be between 0 and 765", file=sys.stderr)
+    max_tolerance = MAX_MANHATTAN_TOLERANCE if args.manhattan else MAX_EUCLIDEAN_TOLERANCE
+    if args.tolerance < 0 or args.tolerance > max_tolerance:
+        metric = "manhattan" if args.manhattan else "euclidean"
+        print(f"Error: --tolerance must be between 0 and {max_tolerance} ({metric})", file=sys.stderr)
+        return 1
+
+    if args.png_compress < 0 or args.png_compress > 9:
+        print("Error: --png-compress must be between 0 and 9", file=sys.stderr)
+        return 1
+
+    if args.jobs is not None and args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
         return 1
 
     # Collect input files
@@ -187,14 +982,32 @@ def main() -> int:
     else:
         print("Key color: auto-detect (top-left pixel)")
     if args.tolerance > 0:
-        print(f"Tolerance: {args.tolerance}")
+        metric = "manhattan" if args.manhattan else "euclidean"
+        print(f"Tolerance: {args.tolerance} ({metric})")
     print()
 
     processed = 0
     skipped = 0
+    # Jobs run concurrently, so at most one job may write each output path,
+    # keyed by resolved path.
+    jobs = {}
 
     for input_file in input_files:
         output_path = resolve_output_path(input_file, args.output, is_batch)
+        claim = output_path.resolve()
+
+        if claim in jobs:
+            if not args.overwrite:
+                # An output an earlier input will write counts as existing:
+                # the first input with a given stem wins.
+                print(f"  SKIP {input_file.name} -> {output_path} (exists, use --overwrite)")
+                skipped += 1
+                continue
+            # Run in order, the last input with a given stem would overwrite
+            # the others, so it replaces the earlier job.
+            earlier, _ = jobs.pop(claim)
+            print(f"  SKIP {earlier.name} -> {output_path} (overwritten by {input_file.name})")
+            skipped += 1
 
         if output_path.exists() and not args.overwrite:
             # Don't overwrite the input file if output would be the same path
@@ -212,29 +1025,37 @@ def main() -> int:
             processed += 1
             continue
 
-        try:
-            img = Image.open(input_file)
-        except Exception as e:
-            print(f"  ERROR {input_file.name}: failed to open: {e}", file=sys.stderr)
-            skipped += 1
-            continue
-
-        result, detected_key, replaced = color_key_image(img, fixed_key, args.tolerance)
+        jobs[claim] = (input_file, output_path)
 
-        total_pixels = result.size[0] * result.size[1]
-        pct = (replaced / total_pixels * 100) if total_pixels > 0 else 0
-
-        # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+    # A job must not rewrite a file another job is still reading.
+    inputs = {input_file.resolve(): input_file for input_file, _ in jobs.values()}
+    for claim, (input_file, output_path) in list(jobs.items()):
+        reader = inputs.get(claim)
+        if reader is not None and reader != input_file:
+            print(f"  SKIP {input_file.name} -> {output_path} (input of {reader.name})")
+            skipped += 1
+            del jobs[claim]
+    jobs = list(jobs.values())
 
-        result.save(output_path, "PNG")
-        key_hex = f"#{detected_key[0]:02X}{detected_key[1]:02X}{detected_key[2]:02X}"
-        print(
-            f"  OK {input_file.name} -> {output_path.name}  "
-            f"key={key_hex}  {replaced}/{total_pixels} pixels ({pct:.1f}%) "
-            f"[{result.size[0]}x{result.size[1]}]"
-        )
-        processed += 1
+    # Trailing _process_task arguments shared by every task.
+    options = (fixed_key, args.tolerance, args.manhattan, not args.no_stats, args.png_compress)
+    stack = bool(jobs) and fixed_key is not None and _uses_numpy_path(args.tolerance)
+    workers = args.jobs or os.cpu_count() or 1
+    tasks = _plan_tasks(jobs, stack, workers)
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        results = (line for task in tasks for line in _process_task(task, *options))
+        ok_count, error_count = _report(results)
+    else:
+        # Files are independent, so they scale across processes; a process
+        # pool sidesteps the GIL for the Python-level parts of the pipeline.
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(_process_task, task, *options) for task in tasks]
+            ok_count, error_count = _report(
+                line for future in as_completed(futures) for line in future.result()
+            )
+    processed += ok_count
+    skipped += error_count
 
     print()
     print(f"Done: {processed} processed, {skipped} skipped")